@@ -5,6 +5,7 @@ Create a beautiful gradient background for the lock screen
 
 from PIL import Image, ImageDraw
 import os
+import sys
 
 def create_gradient_background(width=1920, height=1080):
     """Create a beautiful gradient background image"""
@@ -56,6 +57,14 @@ def main():
     bg_path = 'images/lock_background.png'
     bg_image.save(bg_path)
     print(f"Background saved to {bg_path}")
+    
+    # Optional per-resolution copies (e.g. 2560x1440 3840x2160), used by the lock
+    # screen as-is so it does not have to resize the default image at runtime
+    for size in sys.argv[1:]:
+        width, height = (int(v) for v in size.lower().split('x'))
+        bg_path = f'images/lock_background_{width}x{height}.png'
+        create_gradient_background(width, height).save(bg_path)
+        print(f"Background saved to {bg_path}")
 
 if __name__ == "__main__":
     main()
@@ -5,175 +5,317 @@ A secure screen locker for Ubuntu 22.04 with lightdm integration
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
-import pam
+import glob
+import hashlib
+import logging
 import os
+import re
 import sys
 import subprocess
 import time
 import signal
 import getpass
-import psutil
-from datetime import datetime
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import xml.etree.ElementTree as ET
 
+# PAM이 없으면 check_dependencies()에서 안내 (test_lock_screen은 테스트 비밀번호만으로 동작)
+try:
+    import pam
+except ImportError:
+    pam = None
+
+logger = logging.getLogger(__name__)
+
+# Event.state modifier bits
+_CONTROL_MASK = 0x4
+_ALT_MASK = 0x8
+_SUPER_MASK = 0x40
+_ALT_SUPER_MASK = _ALT_MASK | _SUPER_MASK
+
+# Ctrl+C, Ctrl+V, etc.
+_CTRL_BLOCKED_KEYS = frozenset('cvxzat')
+
+# 키 필터(block_all_keys)를 붙이는 bindtag 이름
+_KEY_FILTER_TAG = 'FTLockKeys'
+
+# Allow basic typing keys and navigation keys
+_NAVIGATION_KEYS = frozenset({
+    'Return', 'BackSpace', 'Delete', 'Left', 'Right', 'Home', 'End',
+    'Tab', 'space', 'Space'  # Space key
+})
+
+# Allow special characters commonly used in passwords
+_SPECIAL_CHAR_KEYS = frozenset({
+    'slash', 'at', 'numbersign', 'dollar', 'percent', 'asciicircum',
+    'ampersand', 'asterisk', 'parenleft', 'parenright', 'minus', 'underscore',
+    'plus', 'equal', 'bracketleft', 'bracketright', 'braceleft', 'braceright',
+    'backslash', 'bar', 'semicolon', 'colon', 'apostrophe', 'quotedbl',
+    'comma', 'period', 'less', 'greater', 'question', 'grave', 'asciitilde',
+    'exclam'
+})
+
+# Keypad keysyms (every X11 keysym with the KP_ prefix)
+_KEYPAD_KEYS = frozenset(f'KP_{i}' for i in range(10)) | frozenset({
+    'KP_Space', 'KP_Tab', 'KP_Enter', 'KP_F1', 'KP_F2', 'KP_F3', 'KP_F4',
+    'KP_Home', 'KP_Left', 'KP_Up', 'KP_Right', 'KP_Down', 'KP_Prior',
+    'KP_Page_Up', 'KP_Next', 'KP_Page_Down', 'KP_End', 'KP_Begin',
+    'KP_Insert', 'KP_Delete', 'KP_Equal', 'KP_Multiply', 'KP_Add',
+    'KP_Separator', 'KP_Subtract', 'KP_Decimal', 'KP_Divide'
+})
+
+_ALLOWED_KEYS = _NAVIGATION_KEYS | _SPECIAL_CHAR_KEYS | _KEYPAD_KEYS
+
+# 실행 중에는 바뀌지 않으므로 모듈 로드 시 한 번만 조회
+_HOSTNAME = os.uname().nodename
+_CURRENT_USER = getpass.getuser()
+
+# EDID 바이트에서 시리얼 추출용 패턴 (연속된 영숫자)
+_EDID_SERIAL_RE = re.compile(rb'[A-Za-z0-9]{6,}')
+
+# xrandr --listactivemonitors 출력에서 connector 추출 (예: " 0: +*eDP-1 3840/344x2160/194+0+0  eDP-1")
+_XRANDR_PRIMARY_MONITOR_RE = re.compile(r'^\s*\d+: \+\*\S+\s.*?(\S+)[ \t]*$', re.M)
+_XRANDR_MONITOR_RE = re.compile(r'^\s*\d+: \+\*?\S+\s.*?(\S+)[ \t]*$', re.M)
+
+# xrandr --current 출력에서 연결된 모니터의 가로 해상도 추출 (예: "eDP-1 connected primary 3840x2160+0+0")
+_XRANDR_PRIMARY_MODE_RE = re.compile(r'^\S+ connected primary (\d+)x\d+\+', re.M)
+_XRANDR_MODE_RE = re.compile(r'^\S+ connected (?:primary )?(\d+)x\d+\+', re.M)
+
+# GNOME 모니터 설정 파일 (모니터별 스케일)
+_MONITORS_XML = os.path.expanduser("~/.config/monitors.xml")
+
+# 화면 크기에 맞춰 리사이즈한 배경 이미지 캐시 위치
+BG_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                            'ft_lock')
+
 
 class FTLock:
+    # 화면에 표시하는 문구 (TestFTLock에서 테스트 모드용으로 바꿈)
+    window_title = "FT Lock"
+    prompt_text = "Enter your password to unlock"
+    owner_text = "Locked for {user}@{host}"
+    
     def __init__(self):
         self.root = None
         self.password_entry = None
         self.status_label = None
+        self._last_status = None  # 마지막으로 표시한 (상태 메시지, 색상)
+        self._timers = {}  # 이름별 대기 중인 after() 타이머 ID
         self.time_label = None  # 실시간 시간 라벨
         self.date_label = None  # 실시간 날짜 라벨
+        self._last_time_str = None  # 마지막으로 표시한 시간 문자열
+        self._last_yday = None  # 마지막으로 표시한 날짜 (연도, 연중 일자)
         self.attempts = 0
         self.max_attempts = 3
-        self.current_user = getpass.getuser()
+        self.lockout_duration = 300  # 잠금 시간 (300초 = 5분)
+        self.current_user = _CURRENT_USER
         self.locked = False
         self.lockout_active = False  # 5분 잠금 상태
-        self.lockout_start_time = None  # 잠금 시작 시간
+        self.lockout_start_time = None  # 잠금 시작 시간 (time.monotonic() 기준)
+        self._scale_cache = None  # (디스플레이 구성 키, 스케일)
+        self._display_scale = None  # 스케일 감지 스레드의 결과
+        self._applied_scale = None  # 입력 컨테이너에 현재 적용된 스케일
+        self._input_container = None
+        self._bg_file = None  # 워커 스레드에서 찾은 캐시 배경 파일 (Tk가 직접 로드)
+        self._pil_bg = None  # 워커 스레드에서 준비한 배경 이미지 (PIL)
+        self._bg_error = None
+        self._pam_local = threading.local()  # 워커 스레드별로 재사용하는 PAM 핸들
+        self._auth_pending = False  # 워커에서 PAM 인증이 진행 중인지 (동시에 하나만 허용)
+        
+        # 인증 요청마다 스레드를 만들지 않고 재사용하는 워커 스레드에서 처리
+        # (_auth_pending으로 진행 중인 시도는 최대 1개이므로 큐에 쌓이지 않음)
+        self._auth_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ftlock-pam")
+        
         self.setup_signal_handlers()
         
-    def get_display_scale(self):
-        """실제 활성화된 모니터의 스케일 가져오기 (monitors.xml과 시리얼 번호 매칭)"""
+    # monitors.xml에서 추출한 스케일 매핑 캐시 (파일 mtime/크기가 바뀔 때만 다시 파싱)
+    _monitors_cache = {'key': None, 'maps': None}
+    
+    def _load_monitor_scales(self, monitors_file):
+        """Return (serial_to_scale, connector_to_scale) from monitors.xml, cached by mtime+size"""
+        st = os.stat(monitors_file)
+        key = (st.st_mtime_ns, st.st_size)
+        cache = self._monitors_cache
+        if cache['key'] == key:
+            return cache['maps']
+        
+        serial_to_scale = {}
+        connector_to_scale = {}
+        
+        # 한 번의 순회로 시리얼/connector 매핑을 모두 생성 (먼저 나온 설정 우선)
+        tree = ET.parse(monitors_file)
+        for config in tree.getroot().findall('configuration'):
+            for lm in config.findall('logicalmonitor'):
+                # 스케일 정보
+                scale_elem = lm.find('scale')
+                scale_val = float(scale_elem.text) if scale_elem is not None else 1.0
+                
+                for monitor in lm.findall('monitor'):
+                    monitorspec = monitor.find('monitorspec')
+                    if monitorspec is None:
+                        continue
+                    
+                    serial = monitorspec.find('serial')
+                    if serial is not None and serial.text:
+                        serial_to_scale.setdefault(serial.text, scale_val)
+                    
+                    connector = monitorspec.find('connector')
+                    if connector is not None and connector.text:
+                        connector_to_scale.setdefault(connector.text, scale_val)
+        
+        cache['key'] = key
+        cache['maps'] = (serial_to_scale, connector_to_scale)
+        return cache['maps']
+        
+    def _enabled_drm_connectors(self):
+        """Return the sysfs directories of connected and enabled DRM connectors"""
+        enabled = []
+        for conn_dir in sorted(glob.glob('/sys/class/drm/card*-*')):
+            try:
+                with open(os.path.join(conn_dir, 'status')) as fp:
+                    if fp.read().strip() != 'connected':
+                        continue
+                with open(os.path.join(conn_dir, 'enabled')) as fp:
+                    if fp.read().strip() != 'enabled':
+                        continue
+            except OSError:
+                continue
+            enabled.append(conn_dir)
+        return enabled
+        
+    def _find_drm_edid(self, enabled):
+        """Return the EDID path of the only enabled DRM connector, or None"""
+        # 여러 모니터가 켜져 있으면 sysfs만으로는 활성 모니터를 알 수 없음
+        # (sysfs 이름은 드라이버마다 xrandr 이름과 달라서 EDID 위치를 찾는 데만 사용)
+        if len(enabled) != 1:
+            return None
+        return os.path.join(enabled[0], 'edid')
+        
+    def _xrandr_active_connector(self):
+        """Return the xrandr name of the primary (or first) active monitor, or None"""
+        # --current: 하드웨어 재탐색 없이 X 서버의 현재 설정만 조회
+        result = subprocess.run(['xrandr', '--current', '--listactivemonitors'], 
+                              capture_output=True, text=True, timeout=5)
+        if result.returncode != 0:
+            raise RuntimeError("xrandr 실행 실패")
+        
+        # primary 모니터 우선, 없으면 첫 번째 활성 모니터
+        match = (_XRANDR_PRIMARY_MONITOR_RE.search(result.stdout)
+                 or _XRANDR_MONITOR_RE.search(result.stdout))
+        return match.group(1) if match else None
+        
+    def get_display_scale(self, logical_width=None):
+        """Return the display scale, re-detecting only when the display setup changed"""
+        # monitors.xml 수정 시각/크기 + 켜진 DRM connector 목록 + 논리 해상도로 변경 여부 판단 (핫플러그 대응)
+        try:
+            st = os.stat(_MONITORS_XML)
+            monitors_key = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            monitors_key = None
+        enabled = self._enabled_drm_connectors()  # 감지에도 그대로 재사용 (sysfs는 한 번만 조회)
+        key = (monitors_key, tuple(enabled), logical_width)
+        
+        if self._scale_cache is not None and self._scale_cache[0] == key:
+            return self._scale_cache[1]
+        
+        scale = self._detect_display_scale(enabled, logical_width)
+        if scale is None:
+            return 1.0  # 감지 실패 (xrandr 오류/타임아웃 등)는 캐시하지 않고 다음에 다시 시도
+        self._scale_cache = (key, scale)
+        return scale
+        
+    def _detect_display_scale(self, enabled, logical_width=None):
+        """실제 활성화된 모니터의 스케일 가져오기 (monitors.xml과 시리얼 번호 매칭, 실패 시 None, 상세 로그는 DEBUG 레벨)"""
         actual_scale = 1.0
         
+        logger.debug("활성 모니터 스케일 감지 중...")
+        
         try:
-            import subprocess
-            import glob
-            import re
-            
-            # 1. 활성 모니터 정보 가져오기
-            result = subprocess.run(['xrandr', '--listactivemonitors'], 
-                                  capture_output=True, text=True, timeout=5)
-            
-            if result.returncode != 0:
-                return 1.0
+            # 1. 활성 모니터 정보 가져오기 (EDID는 sysfs DRM에서 직접 확인, 모호하면 xrandr로 fallback)
+            edid_file = self._find_drm_edid(enabled)
+            active_connector = None  # xrandr/monitors.xml 이름 (sysfs 이름은 드라이버마다 다름)
             
-            active_connector = None
-            
-            for line in result.stdout.split('\n'):
-                if ':' in line and '+' in line:
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        active_connector = parts[-1]  # connector
-                        break
-            
-            if not active_connector:
-                return 1.0
+            if not edid_file:
+                active_connector = self._xrandr_active_connector()
+                logger.debug("활성 모니터: %s", active_connector)
+                
+                if not active_connector:
+                    logger.debug("❌ 활성 모니터를 찾을 수 없음")
+                    return 1.0
+            else:
+                logger.debug("활성 모니터 EDID: %s", edid_file)
             
             # 2. EDID에서 시리얼 번호 추출
             active_serial = None
             
             try:
-                edid_pattern = f'/sys/class/drm/card*/card*-{active_connector}*/edid'
-                edid_files = glob.glob(edid_pattern)
+                if not edid_file:
+                    edid_pattern = f'/sys/class/drm/card*/card*-{active_connector}*/edid'
+                    edid_files = glob.glob(edid_pattern)
+                    edid_file = edid_files[0] if edid_files else None
                 
-                if edid_files:
-                    edid_file = edid_files[0]
-                    
-                    # cat으로 바이너리 읽기
-                    cat_result = subprocess.run(['cat', edid_file], 
-                                              capture_output=True, timeout=5)
+                if edid_file:
+                    # sysfs 파일을 직접 읽기 (cat 프로세스를 띄우지 않음)
+                    with open(edid_file, 'rb') as edid_fp:
+                        edid_data = edid_fp.read()
                     
-                    if cat_result.returncode == 0:
-                        edid_data = cat_result.stdout
+                    if len(edid_data) > 0:
+                        # 시리얼 패턴 찾기 (연속된 영숫자, 첫 번째 패턴만 필요)
+                        # 바이트에 직접 매칭하므로 ASCII 변환 단계가 필요 없음
+                        serial_match = _EDID_SERIAL_RE.search(edid_data)
                         
-                        if len(edid_data) > 0:
-                            # ASCII 문자열 추출
-                            ascii_chars = []
-                            for byte in edid_data:
-                                if 32 <= byte <= 126:  # 출력 가능한 ASCII
-                                    ascii_chars.append(chr(byte))
-                                else:
-                                    ascii_chars.append('.')
-                            
-                            ascii_string = ''.join(ascii_chars)
-                            
-                            # 시리얼 패턴 찾기 (연속된 영숫자)
-                            serial_patterns = re.findall(r'[A-Za-z0-9]{6,}', ascii_string)
-                            
-                            if serial_patterns:
-                                active_serial = serial_patterns[0]  # 첫 번째 패턴 사용
-                            else:
-                                # 패턴이 없으면 hex 사용
-                                active_serial = edid_data.hex()[:20]
-            except:
-                pass
+                        if serial_match:
+                            active_serial = serial_match.group().decode('ascii')  # 첫 번째 패턴 사용
+                            logger.debug("EDID 시리얼: %s", active_serial)
+                        else:
+                            # 패턴이 없으면 hex 사용
+                            active_serial = edid_data.hex()[:20]
+                            logger.debug("EDID hex: %s", active_serial)
+            except Exception as e:
+                logger.debug("EDID 읽기 실패: %s", e)
             
-            # 3. monitors.xml에서 시리얼 번호로 매칭
-            monitors_file = os.path.expanduser("~/.config/monitors.xml")
-            if os.path.exists(monitors_file):
-                tree = ET.parse(monitors_file)
-                root = tree.getroot()
-                
-                configs = root.findall('configuration')
-                
-                for config in configs:
-                    logicalmonitors = config.findall('logicalmonitor')
-                    
-                    for lm in logicalmonitors:
-                        # 스케일 정보
-                        scale_elem = lm.find('scale')
-                        scale_val = float(scale_elem.text) if scale_elem is not None else 1.0
-                        
-                        for monitor in lm.findall('monitor'):
-                            monitorspec = monitor.find('monitorspec')
-                            if monitorspec is not None:
-                                connector = monitorspec.find('connector')
-                                serial = monitorspec.find('serial')
-                                
-                                connector_text = connector.text if connector is not None else 'N/A'
-                                xml_serial = serial.text if serial is not None else 'N/A'
-                                
-                                # 시리얼 번호로 매칭
-                                if (active_serial and xml_serial != 'N/A' and 
-                                    xml_serial == active_serial):
-                                    return scale_val
-                
-                # 시리얼 매칭 실패시 connector로 fallback
-                for config in configs:
-                    logicalmonitors = config.findall('logicalmonitor')
-                    
-                    for lm in logicalmonitors:
-                        scale_elem = lm.find('scale')
-                        scale_val = float(scale_elem.text) if scale_elem is not None else 1.0
-                        
-                        for monitor in lm.findall('monitor'):
-                            monitorspec = monitor.find('monitorspec')
-                            if monitorspec is not None:
-                                connector = monitorspec.find('connector')
-                                
-                                if (connector is not None and 
-                                    connector.text == active_connector):
-                                    return scale_val
+            # 3. monitors.xml에서 시리얼 번호로 매칭 (파일이 없거나 깨졌으면 xrandr fallback)
+            try:
+                serial_to_scale, connector_to_scale = self._load_monitor_scales(_MONITORS_XML)
+            except (OSError, ET.ParseError) as e:
+                logger.debug("❌ monitors.xml 읽기 실패: %s", e)
+                serial_to_scale = connector_to_scale = {}
+            
+            if active_serial and active_serial in serial_to_scale:
+                logger.debug("✅ 시리얼 매칭 성공! Scale: %s", serial_to_scale[active_serial])
+                return serial_to_scale[active_serial]
+            
+            # 시리얼 매칭 실패시 connector로 fallback (이름은 항상 xrandr 기준)
+            if active_connector is None and connector_to_scale:
+                active_connector = self._xrandr_active_connector()
+                logger.debug("활성 모니터: %s", active_connector)
+            
+            if active_connector in connector_to_scale:
+                logger.debug("✅ Connector 매칭 성공! Scale: %s", connector_to_scale[active_connector])
+                return connector_to_scale[active_connector]
+            
+            logger.debug("❌ 매칭 실패, xrandr 해상도로 추정")
             
             # 모든 매칭 실패시 기존 방식으로 fallback
             # 물리적 해상도 가져오기 (xrandr)
-            xrandr_result = subprocess.run(['xrandr'], capture_output=True, text=True, timeout=5)
+            xrandr_result = subprocess.run(['xrandr', '--current'],
+                                           capture_output=True, text=True, timeout=5)
             physical_width = None
             
             if xrandr_result.returncode == 0:
-                # 연결된 디스플레이에서 해상도 추출
-                for line in xrandr_result.stdout.split('\n'):
-                    if ' connected' in line and 'x' in line:
-                        # 예: "eDP-1 connected primary 3840x2160+0+0"
-                        parts = line.split()
-                        for part in parts:
-                            if 'x' in part and '+' in part:
-                                resolution = part.split('+')[0]
-                                if 'x' in resolution:
-                                    physical_width = int(resolution.split('x')[0])
-                                    break
-                        if physical_width:
-                            break
+                # 연결된 디스플레이에서 해상도 추출 (primary 우선)
+                match = (_XRANDR_PRIMARY_MODE_RE.search(xrandr_result.stdout)
+                         or _XRANDR_MODE_RE.search(xrandr_result.stdout))
+                if match:
+                    physical_width = int(match.group(1))
             
             # 논리적 해상도 가져오기 (tkinter)
             if physical_width:
-                temp_root = tk.Tk()
-                logical_width = temp_root.winfo_screenwidth()
-                temp_root.destroy()
+                # 이미 알고 있으면 임시 Tk 창을 만들지 않음 (워커 스레드에서는 Tk 생성 불가)
+                if logical_width is None:
+                    temp_root = tk.Tk()
+                    logical_width = temp_root.winfo_screenwidth()
+                    temp_root.destroy()
                 
                 # 스케일 계산
                 if logical_width > 0:
@@ -190,9 +332,11 @@ class FTLock:
                         actual_scale = 1.0
                         
         except Exception as e:
-            # 모든 방법이 실패하면 기본값 사용
-            pass
+            # xrandr 타임아웃 등 감지 자체가 실패 (호출 측에서 기본값 사용, 캐시하지 않음)
+            logger.debug("❌ 오류: %s", e)
+            return None
         
+        logger.debug("최종 스케일: %s", actual_scale)
         return actual_scale
         
     def setup_signal_handlers(self):
@@ -208,42 +352,18 @@ class FTLock:
         
     def block_all_keys(self, event):
         """Block all key combinations except allowed ones"""
-        # Allow basic typing keys and navigation keys
-        allowed_keys = {
-            'Return', 'BackSpace', 'Delete', 'Left', 'Right', 'Home', 'End',
-            'Tab', 'space', 'Space'  # Space key
-        }
-        
-        # Allow special characters commonly used in passwords
-        special_chars = {
-            'slash', 'at', 'numbersign', 'dollar', 'percent', 'asciicircum',
-            'ampersand', 'asterisk', 'parenleft', 'parenright', 'minus', 'underscore',
-            'plus', 'equal', 'bracketleft', 'bracketright', 'braceleft', 'braceright',
-            'backslash', 'bar', 'semicolon', 'colon', 'apostrophe', 'quotedbl',
-            'comma', 'period', 'less', 'greater', 'question', 'grave', 'asciitilde',
-            'exclam'
-        }
-        
         # Block dangerous key combinations first
-        if event.state & 0x4:  # Control key pressed
-            if event.keysym in ['c', 'v', 'x', 'z', 'a', 't']:  # Ctrl+C, Ctrl+V, etc.
-                return "break"
-                
-        if event.state & 0x8:  # Alt key pressed
-            return "break"  # Block all Alt combinations
-            
-        if event.state & 0x40:  # Super/Windows key pressed
-            return "break"  # Block all Super combinations
+        state = event.state
+        if state & _ALT_SUPER_MASK:
+            return "break"  # Block all Alt/Super combinations
+        if state & _CONTROL_MASK and event.keysym in _CTRL_BLOCKED_KEYS:
+            return "break"
         
-        # Allow normal characters (single character keysyms)
-        if len(event.keysym) == 1:
-            return  # Allow single characters (a-z, A-Z, 0-9, and symbols like /, @, etc.)
-            
-        # Allow specific named keys
-        if (event.keysym in allowed_keys or 
-            event.keysym in special_chars or
-            event.keysym.startswith('KP_')):  # Keypad numbers
-            return  # Allow this key
+        # Allow single characters (a-z, A-Z, 0-9, and symbols like /, @, etc.)
+        # and specific named keys
+        keysym = event.keysym
+        if len(keysym) == 1 or keysym in _ALLOWED_KEYS:
+            return
         
         # Block everything else
         return "break"
@@ -264,13 +384,14 @@ class FTLock:
         try:
             # Ensure window is visible and updated
             self.root.update_idletasks()
-            self.root.after(100, self._delayed_grab)
+            # 고정 100ms 대기 없이 이벤트 루프가 돌기 시작하면 바로 grab (실패하면 _delayed_grab이 재시도)
+            self._after('grab', 0, self._delayed_grab)
             return True
         except Exception as e:
             print(f"Warning: Could not grab input: {e}")
             return False
             
-    def _delayed_grab(self):
+    def _delayed_grab(self, retries=10):
         """Delayed input grabbing after window is ready"""
         try:
             # Global grab to capture all input
@@ -278,87 +399,166 @@ class FTLock:
             self.root.focus_force()
             if self.password_entry:
                 self.password_entry.focus_set()
-                
-            # Keep trying to maintain focus
-            self.root.after(100, self._maintain_focus)
+        except tk.TclError as e:
+            # 창이 아직 매핑되지 않았거나 다른 클라이언트가 grab 중이면 잠시 후 재시도
+            if retries > 0:
+                self._after('grab', 50, self._delayed_grab, retries - 1)
+            else:
+                print(f"Warning: Delayed grab failed: {e}")
         except Exception as e:
             print(f"Warning: Delayed grab failed: {e}")
             
-    def _maintain_focus(self):
-        """Continuously maintain focus and input grab"""
-        if self.locked:
-            try:
-                # Re-grab if lost
-                if not self.root.grab_current():
-                    self.root.grab_set_global()
-                
-                # Ensure window stays on top and focused
-                self.root.attributes('-topmost', True)
-                self.root.focus_force()
+    def _refocus(self):
+        """Restore input grab and focus once"""
+        try:
+            # Re-grab if lost
+            if not self.root.grab_current():
+                self.root.grab_set_global()
+            
+            # Ensure window stays focused (-topmost is handled by _on_visibility)
+            self.root.focus_force()
+            
+            if self.password_entry:
+                self.password_entry.focus_set()
                 
-                if self.password_entry:
-                    self.password_entry.focus_set()
-                    
-            except Exception:
-                pass
+        except Exception:
+            pass
             
-            # Schedule next focus check
-            self.root.after(100, self._maintain_focus)
+    def _on_focus_out(self, event):
+        """Refocus when the lock screen loses focus to another application"""
+        if self.locked:
+            # 포커스 이동이 끝난 뒤 확인 (앱 내부 포커스 이동은 무시)
+            self.root.after_idle(self._refocus_if_lost)
+            
+    def _refocus_if_lost(self):
+        """Refocus only if focus left this application or the input grab was lost"""
+        try:
+            lost = self.root.focus_get() is None or not self.root.grab_current()
+        except Exception:
+            lost = True
+        if self.locked and lost:
+            self._refocus()
+            
+    def _on_visibility(self, event):
+        """Re-assert -topmost only when another window obscures the lock screen"""
+        if event.widget is self.root and event.state != 'VisibilityUnobscured':
+            self.root.attributes('-topmost', True)
+            self.root.lift()
             
     def authenticate_user(self, username, password):
         """Authenticate user using PAM"""
         try:
-            p = pam.pam()
+            p = getattr(self._pam_local, 'pam', None)
+            if p is None:
+                p = self._pam_local.pam = pam.pam()
             return p.authenticate(username, password)
         except Exception as e:
             print(f"Authentication error: {e}")
+            self._pam_local.pam = None  # 다음 시도에서 핸들을 새로 생성
             return False
             
+    def _after(self, name, ms, func, *args):
+        """Schedule a named Tk timer, replacing any pending timer with the same name"""
+        old_id = self._timers.pop(name, None)
+        if old_id is not None:
+            try:
+                self.root.after_cancel(old_id)
+            except Exception:
+                pass
+        self._timers[name] = self.root.after(ms, func, *args)
+        
+    def _cancel_timers(self):
+        """Cancel all pending named timers (called when the screen is unlocked)"""
+        for timer_id in self._timers.values():
+            try:
+                self.root.after_cancel(timer_id)
+            except Exception:
+                pass
+        self._timers.clear()
+        
+    def _safe_after(self, func, *args):
+        """Schedule func(*args) on the Tk thread from a worker (only once mainloop() is running)"""
+        root = self.root
+        if root is None:
+            return
+        try:
+            root.after(0, func, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # 창이 이미 닫혔으면 결과를 버림
+            
+    def _set_status(self, text, color):
+        """Update the status label, skipping redundant reconfigures"""
+        if not self.status_label or self._last_status == (text, color):
+            return
+        self._last_status = (text, color)
+        self.status_label.config(text=text, foreground=color)
+        
     def on_unlock_attempt(self, event=None):
         """Handle unlock attempt"""
+        # 이전 시도의 인증이 끝나기 전에는 입력을 그대로 두고 무시 (시도가 큐에 쌓이지 않도록)
+        if self._auth_pending:
+            return
+        
         password = self.password_entry.get()
         self.password_entry.delete(0, tk.END)
         
         if not password:
-            self.status_label.config(text="Please enter password", foreground="orange")
+            self._set_status("Please enter password", "orange")
             return
             
-        self.status_label.config(text="Authenticating...", foreground="blue")
-        self.root.update()
+        # 잠금 상태 확인은 Tk 스레드에서만 수행
+        if self._check_lockout():
+            return
+            
+        self._start_authentication(password)
+        
+    def _start_authentication(self, password):
+        """Hand the password to the PAM worker thread"""
+        self._set_status("Authenticating...", "blue")
+        # 라벨만 다시 그리면 되므로 이벤트 처리 없이 idle 작업만 실행
+        self.root.update_idletasks()
         
-        # Authenticate in separate thread to avoid blocking UI
-        thread = threading.Thread(target=self._authenticate_threaded, args=(password,))
-        thread.daemon = True
-        thread.start()
+        # Authenticate in the persistent worker thread to avoid blocking UI
+        self._auth_pending = True
+        self._auth_pool.submit(self._authenticate_threaded, password)
+        
+    def _check_lockout(self):
+        """Return True (and show the remaining time) while still in the lockout period"""
+        if self.lockout_active and self.lockout_start_time is not None:
+            remaining = self.lockout_duration - (time.monotonic() - self.lockout_start_time)
+            
+            if remaining > 0:
+                minutes = int(remaining // 60)
+                seconds = int(remaining % 60)
+                self._set_status(f"System locked. Wait {minutes}m {seconds}s more.", "red")
+                return True
+                
+            # 5분이 지났으므로 잠금 해제
+            self.lockout_active = False
+            self.lockout_start_time = None
+            self.attempts = 0
+        return False
         
     def _authenticate_threaded(self, password):
-        """Perform authentication in separate thread"""
-        # Check if still in lockout period
+        """Perform authentication in separate thread (no UI state is touched here)"""
+        ok = self.authenticate_user(self.current_user, password)
+        self._safe_after(self._apply_auth_result, ok)
+        
+    def _apply_auth_result(self, ok, auth_method="PAM"):
+        """Apply an authentication result on the Tk thread"""
+        self._auth_pending = False
+        
+        # 잠금(lockout)이 시작된 뒤 도착한 결과는 성공/실패 모두 반영하지 않음
         if self.lockout_active:
-            if self.lockout_start_time:
-                elapsed = time.time() - self.lockout_start_time
-                remaining = 300 - elapsed  # 300초 = 5분
-                
-                if remaining > 0:
-                    minutes = int(remaining // 60)
-                    seconds = int(remaining % 60)
-                    self.root.after(0, lambda: self.status_label.config(
-                        text=f"System locked. Wait {minutes}m {seconds}s more.", 
-                        foreground="red"))
-                    return
-                else:
-                    # 5분이 지났으므로 잠금 해제
-                    self.lockout_active = False
-                    self.lockout_start_time = None
-                    self.attempts = 0
-        
-        # Try PAM authentication
-        if self.authenticate_user(self.current_user, password):
+            return
+        
+        if ok:
             self.attempts = 0  # 성공 시 시도 횟수 리셋
             self.lockout_active = False  # 잠금 해제
-            self.root.after(0, lambda: self.status_label.config(
-                text="Authentication successful!", foreground="green"))
-            self.root.after(500, self.unlock_screen)
+            self._set_status(self._auth_success_text(auth_method), "green")
+            # 성공 메시지를 그린 직후 바로 잠금 해제 (고정 500ms 대기 없음)
+            self.root.update_idletasks()
+            self.root.after_idle(self.unlock_screen)
             return
         
         # Authentication failed
@@ -368,53 +568,213 @@ class FTLock:
         if self.attempts >= self.max_attempts:
             # 5분 잠금 시작
             self.lockout_active = True
-            self.lockout_start_time = time.time()
-            
-            self.root.after(0, lambda: self.status_label.config(
-                text=f"Max attempts reached. System locked for 5 minutes.", 
-                foreground="red"))
+            self.lockout_start_time = time.monotonic()
             
-            # 5분 후 자동 해제
-            self.root.after(300000, self._clear_lockout)  # 300000ms = 5분
+            self._set_status(f"Max attempts reached. System locked for 5 minutes.", "red")
         else:
-            self.root.after(0, lambda: self.status_label.config(
-                text=f"Invalid password. {remaining} attempts remaining.", 
-                foreground="red"))
+            self._set_status(self._auth_failed_text(remaining), "red")
+            
+    def _auth_success_text(self, auth_method):
+        """Status text shown right before unlocking"""
+        return "Authentication successful!"
+        
+    def _auth_failed_text(self, remaining):
+        """Status text shown after a failed attempt that did not start the lockout"""
+        return f"Invalid password. {remaining} attempts remaining."
     
     def _clear_lockout(self):
-        """Clear lockout after 5 minutes"""
+        """Clear lockout once the lockout period has elapsed"""
         if self.lockout_active:
             self.lockout_active = False
             self.lockout_start_time = None
             self.attempts = 0
-            if self.status_label:
-                self.status_label.config(
-                    text="Lockout expired. You may try again.", 
-                    foreground="orange")
+            self._set_status("Lockout expired. You may try again.", "orange")
                     
     def unlock_screen(self):
         """Unlock the screen and exit"""
         self.locked = False
         self.enable_virtual_terminals()
         if self.root:
+            self._cancel_timers()
             self.root.quit()
             
-    def update_time(self):
-        """Update time and date in real-time"""
-        if self.locked and self.time_label and self.date_label:
-            current_time = datetime.now().strftime("%H:%M:%S")  # 초까지 표시
-            date_str = datetime.now().strftime("%A, %B %d")
-            
+    def update_time(self, now_ts):
+        """Update time and date labels"""
+        now = time.localtime(now_ts)
+        current_time = f"{now.tm_hour:02d}:{now.tm_min:02d}:{now.tm_sec:02d}"  # 초까지 표시
+        
+        # 같은 초 안에 다시 호출된 경우 라벨을 다시 그리지 않음
+        if current_time != self._last_time_str:
+            self._last_time_str = current_time
             self.time_label.config(text=current_time)
-            self.date_label.config(text=date_str)
+        
+        # 날짜는 하루에 한 번만 바뀌므로 날짜가 바뀔 때만 포맷/갱신
+        day = (now.tm_year, now.tm_yday)
+        if day != self._last_yday:
+            self._last_yday = day
+            self.date_label.config(text=time.strftime("%A, %B %d", now))
+            
+    def _tick(self):
+        """Single 1 s housekeeping tick: clock, lockout expiry and focus/grab safety net"""
+        if not self.locked or not self.time_label or not self.date_label:
+            return
             
-            # 1초마다 업데이트
-            self.root.after(1000, self.update_time)
+        now_ts = time.time()
+        self.update_time(now_ts)
+        
+        # 잠금 시간이 지났으면 해제 (별도의 5분 타이머 대신 매 초 확인)
+        if self.lockout_active and self.lockout_start_time is not None:
+            if time.monotonic() - self.lockout_start_time >= self.lockout_duration:
+                self._clear_lockout()
+        
+        # 포커스/grab 안전 점검 (포커스 이동 자체는 <FocusOut>에서 바로 처리)
+        self._refocus_if_lost()
+        
+        # 다음 정각 초에 맞춰 실행 (after(1000) 누적 드리프트 방지)
+        delay = 1000 - int(now_ts % 1 * 1000)
+        self._after('tick', delay, self._tick)
             
+    def _load_background_image(self, bg_path, width, height):
+        """Return (ppm_path, None) for a cached resized background, else (None, PIL image)"""
+        # 원본 내용 + 화면 크기로 캐시 키 생성 (PyInstaller는 실행마다 mtime이 바뀜)
+        # blake2b는 FIPS 모드에서도 막히지 않고 Python 3.8에서도 사용 가능 (md5는 둘 다 문제)
+        with open(bg_path, 'rb') as f:
+            digest = hashlib.blake2b(f.read(), digest_size=6).hexdigest()
+        cache_path = os.path.join(BG_CACHE_DIR, f'bg_{width}x{height}_{digest}.ppm')
+        
+        # 캐시된 PPM은 Tk가 직접 읽으므로 PIL을 로드/디코딩하지 않음
+        if os.path.exists(cache_path):
+            return cache_path, None
+        
+        from PIL import Image  # 캐시가 없을 때만 PIL 로드
+        bg_image = Image.open(bg_path)
+        
+        # 이미 화면 크기와 같으면 리사이즈 생략
+        if bg_image.size != (width, height):
+            # 큰 축소일 때만 LANCZOS, 그 외에는 훨씬 싼 BILINEAR로 충분
+            resampling = getattr(Image, 'Resampling', Image)  # Pillow < 9.1 호환
+            ratio = max(width / bg_image.width, height / bg_image.height)
+            resample = resampling.LANCZOS if ratio < 0.6 else resampling.BILINEAR
+            bg_image = bg_image.resize((width, height), resample)
+        bg_image = bg_image.convert('RGB')  # PPM은 RGB만 저장 가능
+        
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(BG_CACHE_DIR, exist_ok=True)
+            bg_image.save(tmp_path, 'PPM')
+            os.replace(tmp_path, cache_path)
+            
+            # 해상도당 캐시 파일 1개만 유지 (이전 원본의 PPM, 예전 PNG 캐시 삭제)
+            stale = (glob.glob(os.path.join(BG_CACHE_DIR, f'bg_{width}x{height}_*.ppm'))
+                     + glob.glob(os.path.join(BG_CACHE_DIR, 'bg_*.png')))
+            for old_path in stale:
+                if old_path != cache_path:
+                    try:
+                        os.remove(old_path)
+                    except OSError:
+                        pass
+        except Exception as e:
+            print(f"Warning: Could not cache background image: {e}")
+            try:
+                os.remove(tmp_path)  # 저장 도중 실패한 임시 파일 정리
+            except OSError:
+                pass
+            # 캐시 파일이 없으므로 이번에는 PIL 이미지를 그대로 사용
+            return None, bg_image
+        
+        # 저장에 성공하면 PIL 이미지는 버리고 Tk가 PPM을 직접 읽게 함 (메모리 캐시에 큰 이미지를 잡아두지 않음)
+        return cache_path, None
+        
+    # 리사이즈된 배경 이미지의 프로세스 내 캐시 (스크린세이버 모드에서 잠글 때마다 다시 디코딩하지 않음)
+    _bg_memory_cache = {'key': None, 'image': None}
+    
+    def _prepare_background(self, bg_path, width, height):
+        """Decode and resize the background image (runs in a worker thread, no Tk calls)"""
+        self._bg_file = None
+        self._pil_bg = None
+        self._bg_error = None
+        try:
+            st = os.stat(bg_path)
+            key = (bg_path, st.st_mtime_ns, st.st_size, width, height)
+            cache = self._bg_memory_cache
+            if cache['key'] != key:
+                cache['image'] = self._load_background_image(bg_path, width, height)
+                cache['key'] = key
+            self._bg_file, self._pil_bg = cache['image']
+        except Exception as e:
+            self._bg_error = e
+            
+    def _attach_background(self, bg_thread, width, height):
+        """Place the prepared background image behind the already-built lock UI"""
+        # Tk 스레드에서 join하지 않음: 워커가 끝날 때까지 짧게 다시 확인
+        if bg_thread.is_alive():
+            self._after('bg', 20, self._attach_background, bg_thread, width, height)
+            return
+        
+        try:
+            if self._bg_error:
+                raise self._bg_error
+            # PhotoImage는 Tk 스레드에서만 생성
+            if self._bg_file:
+                try:
+                    # 캐시된 PPM은 PIL 없이 Tk가 직접 디코딩
+                    self.bg_photo = tk.PhotoImage(file=self._bg_file)
+                except tk.TclError:
+                    # 손상된 캐시는 버리고 다음 잠금 때 다시 생성
+                    self._bg_memory_cache['key'] = None
+                    try:
+                        os.remove(self._bg_file)
+                    except OSError:
+                        pass
+                    raise
+            else:
+                from PIL import ImageTk
+                self.bg_photo = ImageTk.PhotoImage(self._pil_bg)
+            
+            # Create background label that covers entire screen, below the lock UI
+            bg_label = tk.Label(self.root, image=self.bg_photo)
+            bg_label.place(x=0, y=0, width=width, height=height)
+            bg_label.lower()
+        except Exception as e:
+            print(f"Warning: Could not load background image: {e}")
+            self.root.configure(bg='#1a1a2e')
+            
+    def _scale_worker(self, logical_width):
+        """Detect the display scale off the Tk thread (the Tk thread picks it up in _poll_scale)"""
+        try:
+            scale = self.get_display_scale(logical_width)
+        except Exception:
+            scale = 1.0
+        self._display_scale = scale
+        
+    def _poll_scale(self, scale_thread):
+        """Apply the detected scale once the worker has finished (runs on the Tk thread)"""
+        if scale_thread.is_alive():
+            self._after('scale', 50, self._poll_scale, scale_thread)
+            return
+        if self._display_scale is not None:
+            self._apply_scale(self._display_scale)
+        
+    def _container_size(self, scale):
+        """Return (width, height) of the input container for the given scale"""
+        if scale > 1.0:
+            return int(450 * scale), int(400 * scale)  # 적당한 크기로 조정
+        return 450, 400
+        
+    def _apply_scale(self, scale):
+        """Resize the input container if detection finished after the first layout"""
+        if scale == self._applied_scale or self._input_container is None:
+            return
+        self._applied_scale = scale
+        width, height = self._container_size(scale)
+        self._input_container.place_configure(width=width, height=height)
+        
     def create_lock_screen(self):
         """Create the lock screen GUI with full screen background"""
         self.root = tk.Tk()
-        self.root.title("FT Lock")
+        # 위젯 트리를 모두 만든 뒤 한 번에 표시 (속성/배치 변경마다 다시 그리지 않도록)
+        self.root.withdraw()
+        self.root.title(self.window_title)
         self.root.configure(bg='black')
         
         # tkinter가 시스템 DPI 스케일링을 무시하도록 설정
@@ -423,17 +783,33 @@ class FTLock:
         except Exception as e:
             pass
         
-        # 디스플레이 스케일 가져오기
-        display_scale = self.get_display_scale()
-            
-        # Make window fullscreen and topmost
-        self.root.attributes('-fullscreen', True)
-        self.root.attributes('-topmost', True)
-        
         # Get screen dimensions BEFORE overrideredirect
         screen_width = self.root.winfo_screenwidth()
         screen_height = self.root.winfo_screenheight()
         
+        # 배경 이미지 디코딩/리사이즈는 스케일 감지와 병렬로 워커 스레드에서 수행 (PIL만 사용)
+        images_dir = os.path.join(os.path.dirname(__file__), 'images')
+        # 현재 해상도용으로 미리 만들어 둔 배경이 있으면 리사이즈 없이 그대로 사용
+        bg_path = os.path.join(images_dir, f'lock_background_{screen_width}x{screen_height}.png')
+        if not os.path.exists(bg_path):
+            bg_path = os.path.join(images_dir, 'lock_background.png')
+        bg_thread = None
+        if os.path.exists(bg_path):
+            bg_thread = threading.Thread(target=self._prepare_background,
+                                         args=(bg_path, screen_width, screen_height))
+            bg_thread.daemon = True
+            bg_thread.start()
+        
+        # 디스플레이 스케일 감지(xrandr/EDID/monitors.xml)는 창 표시를 막지 않도록 워커 스레드에서 수행
+        self._display_scale = None  # 이전 잠금의 결과로 레이아웃을 잡지 않도록 초기화
+        scale_thread = threading.Thread(target=self._scale_worker, args=(screen_width,))
+        scale_thread.daemon = True
+        scale_thread.start()
+        
+        # Make window fullscreen and topmost
+        self.root.attributes('-fullscreen', True)
+        self.root.attributes('-topmost', True)
+        
         # Now remove window decorations
         self.root.overrideredirect(True)
         
@@ -442,49 +818,30 @@ class FTLock:
         
         # Block all key combinations globally
         self.root.bind('<Key>', self.block_all_keys)
-        self.root.bind('<KeyPress>', self.block_all_keys)
         
         # Block window manager protocols
         self.root.protocol("WM_DELETE_WINDOW", lambda: None)
         self.root.protocol("WM_TAKE_FOCUS", lambda: self.root.focus_force())
+        self.root.bind('<Visibility>', self._on_visibility)
+        self.root.bind('<FocusOut>', self._on_focus_out)
         
-        # Load and set background image
-        try:
-            bg_path = os.path.join(os.path.dirname(__file__), 'images', 'lock_background.png')
-            if os.path.exists(bg_path):
-                # Load and resize background image to fit screen
-                bg_image = Image.open(bg_path)
-                
-                # Handle different Pillow versions for resampling
-                try:
-                    # New Pillow versions (10.0.0+)
-                    bg_image = bg_image.resize((screen_width, screen_height), Image.Resampling.LANCZOS)
-                except AttributeError:
-                    # Older Pillow versions
-                    bg_image = bg_image.resize((screen_width, screen_height), Image.LANCZOS)
-                
-                self.bg_photo = ImageTk.PhotoImage(bg_image)
-                
-                # Create background label that covers entire screen
-                bg_label = tk.Label(self.root, image=self.bg_photo)
-                bg_label.place(x=0, y=0, width=screen_width, height=screen_height)
-            else:
-                # Fallback to gradient background
-                self.root.configure(bg='#1a1a2e')
-        except Exception as e:
-            print(f"Warning: Could not load background image: {e}")
+        # 배경 이미지는 입력 UI 표시/grab 이후에 붙임 (아래 grab_input 다음에 예약)
+        if bg_thread is None:
+            # Fallback to gradient background
             self.root.configure(bg='#1a1a2e')
         
         # Create center container for passcode input (가운데로 이동)
-        # 스케일에 따라 컨테이너 크기 조정 (적당한 크기로)
-        if display_scale > 1.0:
-            container_width = int(450 * display_scale)  # 적당한 크기로 조정
-            container_height = int(400 * display_scale)
-        else:
-            container_width = 450
-            container_height = 400
+        # 스케일에 따라 컨테이너 크기 조정 (감지가 늦으면 1.0으로 먼저 그리고 _apply_scale에서 조정)
+        scale_thread.join(timeout=0.05)
+        display_scale = self._display_scale or 1.0
+        self._applied_scale = display_scale
+        if scale_thread.is_alive():
+            # 워커는 Tk를 건드리지 않으므로 결과는 Tk 스레드에서 주기적으로 확인
+            self._after('scale', 50, self._poll_scale, scale_thread)
+        container_width, container_height = self._container_size(display_scale)
         
         input_container = tk.Frame(self.root, bg='black', relief='flat')
+        self._input_container = input_container
         input_container.place(relx=0.5, rely=0.5, anchor='center', width=container_width, height=container_height)
         
         # Lock icon in input container
@@ -493,7 +850,15 @@ class FTLock:
         lock_label.pack(pady=(20, 10))
         
         # System info (실시간 업데이트를 위해 라벨을 인스턴스 변수로 저장)
-        hostname = os.uname().nodename
+        hostname = _HOSTNAME
+        
+        # 이전 잠금에서 결과가 버려진 시도가 있어도 새 잠금 화면에서는 입력을 받음
+        self._auth_pending = False
+        
+        # 라벨을 새로 만들므로 "변경 시에만 다시 그리기" 캐시도 초기화 (스크린세이버 재잠금 대비)
+        self._last_time_str = None
+        self._last_yday = None
+        self._last_status = None
         
         self.time_label = tk.Label(input_container, text="", 
                              font=("Arial", 20, "bold"), bg='black', fg='white')
@@ -519,8 +884,11 @@ class FTLock:
         self.password_entry.focus_set()
         self.password_entry.bind('<Return>', self.on_unlock_attempt)
         
-        # Allow only specific keys in password entry
-        self.password_entry.bind('<Key>', lambda e: None if self.block_all_keys(e) != "break" else "break")
+        # Allow only specific keys in password entry (single dispatch per keystroke:
+        # 필터 태그를 Entry 클래스 바인딩 앞에 두고, root('.') 태그는 빼서
+        # root의 <Key> 핸들러가 같은 키를 다시 검사하지 않도록 함)
+        self.root.bind_class(_KEY_FILTER_TAG, '<Key>', self.block_all_keys)
+        self.password_entry.bindtags((str(self.password_entry), _KEY_FILTER_TAG, 'Entry', 'all'))
         
         # Unlock button with modern styling
         unlock_btn = tk.Button(input_container, text="Unlock", font=("Arial", 12, "bold"),
@@ -530,7 +898,7 @@ class FTLock:
         unlock_btn.pack(pady=(0, 10))
         
         # Status label
-        self.status_label = tk.Label(input_container, text="Enter your password to unlock", font=("Arial", 10),
+        self.status_label = tk.Label(input_container, text=self.prompt_text, font=("Arial", 10),
                                     bg='black', fg='orange', wraplength=350)
         self.status_label.pack(pady=(0, 10))
         
@@ -539,16 +907,24 @@ class FTLock:
         bottom_container.place(relx=0.5, rely=0.95, anchor='center')
         
         user_info = tk.Label(bottom_container, 
-                            text=f"Locked for {self.current_user}@{hostname}",
+                            text=self.owner_text.format(user=self.current_user, host=hostname),
                             font=("Arial", 12), bg='black', fg='gray')
         user_info.pack()
         
         # Ensure window is shown before grabbing input
+        self.root.deiconify()
         self.root.update()
         self.grab_input()
         
-        # 실시간 시간 업데이트 시작
-        self.update_time()
+        # 시계는 바로 표시하고, 포커스/grab 점검(_tick)은 다음 정각 초부터 시작
+        # (초기 grab은 grab_input의 _delayed_grab이 담당)
+        now_ts = time.time()
+        self.update_time(now_ts)
+        self._after('tick', 1000 - int(now_ts % 1 * 1000), self._tick)
+        
+        # Load and set background image (입력 UI가 먼저 그려지고 grab된 뒤 뒤쪽에 붙임)
+        if bg_thread is not None:
+            self._after('bg', 0, self._attach_background, bg_thread, screen_width, screen_height)
         
         return self.root
         
@@ -642,9 +1018,7 @@ class FTLock:
 
 def check_dependencies():
     """Check if required dependencies are installed"""
-    try:
-        import pam
-    except ImportError:
+    if pam is None:
         print("Error: python3-pam not installed")
         print("Install with: apt install python3-pam")
         return False
@@ -652,8 +1026,16 @@ def check_dependencies():
     return True
 
 
+def setup_logging():
+    """Configure logging for the entry points (scale detection details only with FTLOCK_DEBUG=1)"""
+    logging.basicConfig(level=logging.DEBUG if os.environ.get('FTLOCK_DEBUG') else logging.WARNING,
+                        format='%(message)s')
+
+
 def main():
     """Main function"""
+    setup_logging()
+    
     if not check_dependencies():
         sys.exit(1)
         
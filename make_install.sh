@@ -47,9 +47,6 @@ docker run --rm -v $(pwd):/workspace -w /workspace ubuntu:22.04 bash -c "
     echo '   Installing python-pam...'
     pip3 install python-pam
     
-    echo '   Installing psutil...'
-    pip3 install psutil
-    
     echo '   Installing six...'
     pip3 install six
     
@@ -71,26 +68,20 @@ docker run --rm -v $(pwd):/workspace -w /workspace ubuntu:22.04 bash -c "
             --add-data 'images:images' \
             --hidden-import=six \
             --hidden-import=pam \
-            --hidden-import=psutil \
             --hidden-import=PIL \
             --hidden-import=PIL.Image \
             --hidden-import=PIL.ImageTk \
             --hidden-import=PIL.ImageDraw \
             --hidden-import=tkinter \
-            --hidden-import=tkinter.ttk \
-            --hidden-import=tkinter.messagebox \
             ft_lock.py --distpath /workspace/dist
     else
         pyinstaller --onefile --name 'ft-lock' \
             --hidden-import=six \
             --hidden-import=pam \
-            --hidden-import=psutil \
             --hidden-import=PIL \
             --hidden-import=PIL.Image \
             --hidden-import=PIL.ImageTk \
             --hidden-import=tkinter \
-            --hidden-import=tkinter.ttk \
-            --hidden-import=tkinter.messagebox \
             ft_lock.py --distpath /workspace/dist
     fi
     